@@ -1,17 +1,60 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import asyncio
+import itertools
+import time
+from typing import List, Optional
+
+from fastapi import Depends
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from pgvector.asyncpg import register_vector
+
+from app.config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DATABASE_REPLICA_URLS,
+    REPLICA_MAX_LAG_SECONDS,
+    REPLICA_LAG_CHECK_INTERVAL,
+    REPLICA_CONNECT_TIMEOUT,
+)
+
 
-from app.config import DATABASE_URL, ASYNC_DATABASE_URL
+def register_vector_codec(dbapi_connection, connection_record):
+    """Send and receive vectors in pgvector's binary format instead of text."""
+    dbapi_connection.run_async(register_vector)
 
 
+def create_engine_with_pool(url: str, connect_timeout: Optional[float] = None) -> AsyncEngine:
+    """Create an async engine with the configured pool settings and vector codec."""
+    engine = create_async_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args={"timeout": connect_timeout} if connect_timeout else {}
+    )
+    event.listen(engine.sync_engine, "connect", register_vector_codec)
+    return engine
+
+
+async_engine = create_engine_with_pool(ASYNC_DATABASE_URL)
+replica_engines = [
+    create_engine_with_pool(url, connect_timeout=REPLICA_CONNECT_TIMEOUT) for url in DATABASE_REPLICA_URLS
+]
 
-async_engine = create_async_engine(ASYNC_DATABASE_URL)
 AsyncSessionLocal = sessionmaker(
-    class_=AsyncSession, 
-    autocommit=False, 
-    autoflush=False, 
+    class_=AsyncSession,
+    autocommit=False,
+    autoflush=False,
     bind=async_engine
 )
 
@@ -19,6 +62,117 @@ AsyncSessionLocal = sessionmaker(
 Base = declarative_base()
 
 
+# Seconds the replica is behind; 0 when it has replayed everything it received,
+# so an idle primary does not make its replicas look stale. NULL (unhealthy)
+# when the replica was promoted or its WAL receiver is not streaming, since it
+# then stops receiving changes while its receive and replay positions still
+# match. Reading pg_stat_wal_receiver.status needs pg_read_all_stats.
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN NULL
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+# Errors meaning a replica could not be reached.
+CONNECTION_ERRORS = (SQLAlchemyError, OSError, asyncio.TimeoutError)
+
+
+class ReplicaState:
+    """Last known health of a read replica."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.healthy = True
+        self.checked_at = float("-inf")
+        self._check: Optional[asyncio.Task] = None
+        event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context) -> None:
+        # Failed pre-pings and dropped connections take the replica out of
+        # rotation right away rather than at its next lag check.
+        if context.is_disconnect:
+            self.mark_unhealthy()
+
+    def mark_unhealthy(self) -> None:
+        self.healthy = False
+
+    def schedule_refresh(self) -> None:
+        """Start a lag check in the background if one is due and none is running."""
+        if self._check is not None and not self._check.done():
+            return
+        if time.monotonic() - self.checked_at < REPLICA_LAG_CHECK_INTERVAL:
+            return
+        self.checked_at = time.monotonic()
+        self._check = asyncio.ensure_future(self.refresh())
+
+    async def refresh(self) -> None:
+        try:
+            lag = await asyncio.wait_for(self._lag(), REPLICA_CONNECT_TIMEOUT)
+            self.healthy = lag is not None and float(lag) <= REPLICA_MAX_LAG_SECONDS
+        except Exception:
+            self.healthy = False
+
+    async def _lag(self) -> Optional[float]:
+        async with self.engine.connect() as conn:
+            return (await conn.execute(REPLICA_LAG_SQL)).scalar()
+
+
+class ReplicaRouter:
+    """
+    Route read-only sessions to read replicas in round-robin order.
+
+    Each replica's lag is checked in the background at most every
+    REPLICA_LAG_CHECK_INTERVAL seconds, so requests never wait on a check;
+    lagging or unreachable replicas are skipped, and reads fall back to the
+    primary when no replica is usable.
+    """
+
+    def __init__(self, primary: AsyncEngine, replicas: List[AsyncEngine]):
+        self.primary = primary
+        self.replicas = [ReplicaState(engine) for engine in replicas]
+        self._next = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+
+    def read_replica(self) -> Optional[ReplicaState]:
+        """Return the next healthy replica, or None to read from the primary."""
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._next)]
+            replica.schedule_refresh()
+            if replica.healthy:
+                return replica
+        return None
+
+
+replica_router = ReplicaRouter(async_engine, replica_engines)
+
+
 async def get_async_db():
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+async def get_async_read_db(db: AsyncSession = Depends(get_async_db)):
+    """
+    Session for read-only work, bound to a replica when one is usable.
+
+    Without a usable replica this is the request's primary session, so a
+    request never holds two connections from the primary pool.
+    """
+    replica = replica_router.read_replica()
+    if replica is not None:
+        async with AsyncSessionLocal(bind=replica.engine) as session:
+            try:
+                # Check out a connection up front so an unreachable replica
+                # falls back to the primary instead of failing the request,
+                # then hand it back until the session actually runs a query.
+                await session.connection()
+                await session.commit()
+            except CONNECTION_ERRORS:
+                replica.mark_unhealthy()
+            else:
+                yield session
+                return
+
+    yield db
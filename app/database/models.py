@@ -1,12 +1,12 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, DateTime, Integer, BigInteger, LargeBinary, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy_utils import ScalarListType
-from pgvector.sqlalchemy import Vector
 
 from app.database.db_connection import Base
+from app.database.types import Vector
 from app.config import EMBEDDING_DIMENSION
 
 class Document(Base):
@@ -16,12 +16,26 @@ class Document(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(255), nullable=False)
     source = Column(String(255), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    chunk_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Cleaned original text, zstd-compressed; loaded only when explicitly requested.
+    content_zstd = deferred(Column(LargeBinary, nullable=True))
+    content_size = Column(BigInteger, nullable=True)  # Size of the original text in UTF-8 bytes
+    # content_zstd is a sequence of zstd frames of content_frame_size bytes each;
+    # content_frame_offsets holds where each frame starts (plus the blob length).
+    content_frame_size = Column(Integer, nullable=True)
+    content_frame_offsets = Column(ARRAY(BigInteger), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     
     chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        # Keyset pagination on (created_at, id), optionally filtered by source.
+        Index("ix_documents_created_at_id", "created_at", "id"),
+        Index("ix_documents_source_created_at_id", "source", "created_at", "id"),
+    )
+    
     def __repr__(self):
         return f"<Document(id={self.id}, title='{self.title}')>"
 
@@ -31,10 +45,10 @@ class DocumentChunk(Base):
     __tablename__ = "document_chunks"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True)
     chunk_index = Column(Integer, nullable=False)
     content = Column(Text, nullable=False)
-    embedding = Column(Vector(EMBEDDING_DIMENSION), nullable=True)
+    embedding = deferred(Column(Vector(EMBEDDING_DIMENSION), nullable=True))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -0,0 +1,23 @@
+from pgvector.sqlalchemy import Vector as _Vector
+
+
+class Vector(_Vector):
+    """
+    pgvector column type that leaves encoding to the asyncpg binary codec.
+
+    pgvector's SQLAlchemy type formats every bound vector as a text literal.
+    On asyncpg connections the binary codec registered in db_connection
+    encodes lists and NumPy arrays directly, so values are passed through
+    as-is there; other drivers (psycopg2 for migrations) keep the text format.
+    """
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        if dialect.driver != "asyncpg":
+            return super().bind_processor(dialect)
+
+        def process(value):
+            if value is not None and self.dim is not None and len(value) != self.dim:
+                raise ValueError('expected %d dimensions, not %d' % (self.dim, len(value)))
+            return value
+        return process
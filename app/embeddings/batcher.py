@@ -0,0 +1,82 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class EmbeddingBatcher:
+    """
+    Collect single-text embedding requests and send them as one batch.
+
+    A batch is sent once ``max_batch_size`` texts are pending or ``max_wait``
+    seconds after the first pending text arrived, whichever comes first, so
+    the latency added to any caller is bounded by ``max_wait``.
+    """
+
+    def __init__(self,
+                 embed_batch: Callable[[List[str]], Awaitable[List[np.ndarray]]],
+                 max_batch_size: int,
+                 max_wait: float):
+        self.embed_batch = embed_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> np.ndarray:
+        """
+        Queue a text for the next batch and wait for its embedding.
+
+        Args:
+            text: The text to embed
+
+        Returns:
+            Float32 array representing the text embedding
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            embeddings = await self.embed_batch([text for text, _ in batch])
+            if len(embeddings) != len(batch):
+                raise ValueError(f"Expected {len(batch)} embeddings, got {len(embeddings)}")
+        except BaseException as exc:
+            # Includes CancelledError (e.g. the flush task cancelled at
+            # shutdown): callers get an error instead of waiting forever.
+            error = exc if isinstance(exc, Exception) else RuntimeError(f"Embedding batch aborted: {exc!r}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            if error is not exc:
+                raise
+        else:
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+        finally:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Embedding batch finished without a result"))
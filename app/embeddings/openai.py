@@ -1,57 +1,129 @@
-import os
-from typing import List, Union
-from openai import AsyncOpenAI
+import base64
+import hashlib
+from typing import Dict, List, Union
+import numpy as np
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from app.config import OPENAI_API_KEY, EMBEDDING_MODEL
+from app.config import (
+    OPENAI_API_KEY,
+    EMBEDDING_MODEL,
+    EMBEDDING_BATCH_WINDOW_MS,
+    EMBEDDING_BATCH_MAX_SIZE,
+)
+from app.embeddings.batcher import EmbeddingBatcher
+from app.utils.singleflight import SingleFlight
+from app.utils.text_processings import normalize_query
+
+
+# Shared per process so that identical requests handled by different
+# OpenAIEmbeddings instances (one per request) are coalesced.
+_query_flights = SingleFlight()
+_text_flights = SingleFlight()
+_batchers: Dict[str, EmbeddingBatcher] = {}
+_client = None
+
+
+def get_openai_client():
+    """
+    Return the process-wide AsyncOpenAI client.
+
+    The openai package is imported on first use rather than at worker startup.
+    """
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI
+        _client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    return _client
+
+
+def _text_key(model_name: str, text: str) -> tuple:
+    return (model_name, hashlib.sha256(text.encode("utf-8")).digest())
+
+
+def _decode_embedding(data: str) -> np.ndarray:
+    # Base64 little-endian float32, decoded without a round trip through a list of floats.
+    return np.frombuffer(base64.b64decode(data), dtype="<f4")
+
 
 class OpenAIEmbeddings:
     """Wrapper for OpenAI embedding models."""
-    
+
     def __init__(self, model_name: str = EMBEDDING_MODEL):
         self.model_name = model_name
-        self.client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-        
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
-    async def embed_text(self, text: str) -> List[float]:
+        self.client = get_openai_client()
+
+    async def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embeddings for a single text using OpenAI's embedding model.
-        
+
+        Concurrent calls for the same normalized text share one request, and
+        calls for different texts arriving within EMBEDDING_BATCH_WINDOW_MS
+        are micro-batched into a single embeddings request.
+
         Args:
             text: The text to embed
-            
+
         Returns:
-            List of floats representing the text embedding
+            Float32 array representing the text embedding
         """
-        response = await self.client.embeddings.create(
-            model=self.model_name,
-            input=text
-        )
-        return response.data[0].embedding
-    
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
-    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        key = (self.model_name, normalize_query(text))
+        if EMBEDDING_BATCH_WINDOW_MS > 0:
+            embed = lambda: self._batcher().embed(text)
+        else:
+            embed = lambda: self._embed_one(text)
+        return await _query_flights.do(key, embed)
+
+    async def embed_texts(self, texts: List[str]) -> List[np.ndarray]:
         """
         Generate embeddings for multiple texts in a batch.
-        
+
+        Texts already being embedded by a concurrent call (matched by content
+        hash) are not sent again; their embeddings are shared instead.
+
         Args:
             texts: List of texts to embed
-            
+
         Returns:
             List of embeddings, one for each input text
         """
         if not texts:
             return []
-        
+
+        keys = [_text_key(self.model_name, text) for text in texts]
+        return await _text_flights.do_many(keys, texts, self._embed_batch)
+
+    def _batcher(self) -> EmbeddingBatcher:
+        batcher = _batchers.get(self.model_name)
+        if batcher is None:
+            batcher = EmbeddingBatcher(
+                self._embed_batch,
+                max_batch_size=EMBEDDING_BATCH_MAX_SIZE,
+                max_wait=EMBEDDING_BATCH_WINDOW_MS / 1000
+            )
+            _batchers[self.model_name] = batcher
+        return batcher
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10)
+    )
+    async def _embed_one(self, text: str) -> np.ndarray:
         response = await self.client.embeddings.create(
             model=self.model_name,
-            input=texts
+            input=text,
+            encoding_format="base64"
         )
-        
-        return [item.embedding for item in response.data]
\ No newline at end of file
+        return _decode_embedding(response.data[0].embedding)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10)
+    )
+    async def _embed_batch(self, texts: List[str]) -> List[np.ndarray]:
+        response = await self.client.embeddings.create(
+            model=self.model_name,
+            input=texts,
+            encoding_format="base64"
+        )
+
+        return [_decode_embedding(item.embedding) for item in response.data]
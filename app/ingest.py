@@ -0,0 +1,297 @@
+"""
+Offline bulk ingestion of a directory of PDF files.
+
+Parses PDFs in parallel worker processes, embeds their chunks in large
+concurrent batches (pooling chunks from several documents) and writes them
+with COPY, bypassing the API servers.
+Completed files are recorded in a manifest so an interrupted run can be
+resumed by running the same command again.
+
+Usage:
+    python -m app.ingest data/ [--workers N] [--embed-batch-size N]
+                               [--embed-concurrency N] [--manifest PATH]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+import numpy as np
+from pgvector.asyncpg import register_vector
+
+from app.config import ASYNCPG_DSN
+from app.embeddings.batcher import EmbeddingBatcher
+from app.embeddings.openai import OpenAIEmbeddings
+from app.utils.compression import compress_text
+from app.utils.text_processings import chunk_text, clean_text, extract_metadata, extract_pdf_text
+
+
+MANIFEST_NAME = ".ingest-manifest.jsonl"
+
+# The embeddings API accepts at most this many inputs per request.
+MAX_EMBED_BATCH_SIZE = 2048
+
+# Seconds a partial batch waits for chunks from other documents before it is sent.
+EMBED_BATCH_WAIT = 0.1
+
+CHUNK_COLUMNS = ["id", "document_id", "chunk_index", "content", "embedding", "created_at", "updated_at"]
+
+
+@dataclass
+class IngestStats:
+    """Counters for the throughput summary."""
+    loaded: int = 0
+    skipped: int = 0
+    failed: int = 0
+    chunks: int = 0
+    bytes: int = 0
+
+
+def document_id_for(path: Path, root: Path) -> uuid.UUID:
+    """
+    Derive a stable document ID from a file's relative path, size and mtime.
+
+    Re-running an interrupted ingestion therefore maps each file to the same
+    document, so a file committed just before a crash is not loaded twice.
+    """
+    stat = path.stat()
+    key = f"{path.relative_to(root).as_posix()}:{stat.st_size}:{stat.st_mtime_ns}"
+    return uuid.uuid5(uuid.NAMESPACE_URL, key)
+
+
+def parse_pdf(path: str) -> Dict[str, Any]:
+    """
+    Extract, clean and chunk a PDF. Runs in a worker process.
+
+    Args:
+        path: Path to the PDF file
+
+    Returns:
+        Dictionary with title, compressed content (with its frame index) and chunks
+    """
+    content = clean_text(extract_pdf_text(path))
+    metadata = extract_metadata(content)
+    compressed = compress_text(content)
+    return {
+        "title": (metadata.get("title") or Path(path).stem or "Untitled Document")[:255],
+        "content_zstd": compressed.blob,
+        "content_size": compressed.size,
+        "content_frame_size": compressed.frame_size,
+        "content_frame_offsets": compressed.frame_offsets,
+        "chunks": chunk_text(content),
+    }
+
+
+def read_manifest(manifest: Path) -> Dict[str, str]:
+    """
+    Return the files already loaded by previous runs.
+
+    Maps each relative path to the document ID it was loaded as, so a file
+    that changed since (and therefore has a new ID) is ingested again.
+    """
+    done: Dict[str, str] = {}
+    if not manifest.exists():
+        return done
+    with manifest.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by a crash.
+                continue
+            if entry.get("status") == "ok" and entry.get("document_id"):
+                done[entry["path"]] = entry["document_id"]
+    return done
+
+
+class BulkIngestor:
+    """Pipeline that parses, embeds and stores a directory of PDFs."""
+
+    def __init__(self,
+                 root: Path,
+                 manifest: Path,
+                 workers: int,
+                 embed_batch_size: int,
+                 embed_concurrency: int,
+                 embeddings: Optional[OpenAIEmbeddings] = None):
+        self.root = root
+        self.manifest = manifest
+        self.workers = workers
+        self.embed_batch_size = embed_batch_size
+        # Chunks of all documents in flight share batches, so requests fill up
+        # to embed_batch_size even when each document has only a few chunks.
+        self._batcher = EmbeddingBatcher(self._embed_batch, max_batch_size=embed_batch_size,
+                                         max_wait=EMBED_BATCH_WAIT)
+        self.embeddings = embeddings or OpenAIEmbeddings()
+        self.stats = IngestStats()
+        self._embed_slots = asyncio.Semaphore(embed_concurrency)
+        # Bound the number of parsed documents held in memory at once. Each
+        # document waiting on embeddings holds a slot, so keep at least one
+        # per embedding request or --embed-concurrency could never be reached.
+        self._document_slots = asyncio.Semaphore(max(workers * 2, embed_concurrency))
+
+    async def run(self) -> IngestStats:
+        paths = sorted(p for p in self.root.rglob("*") if p.suffix.lower() == ".pdf" and p.is_file())
+        done = read_manifest(self.manifest)
+        pending = [
+            p for p in paths
+            if done.get(p.relative_to(self.root).as_posix()) != str(document_id_for(p, self.root))
+        ]
+        self.stats.skipped = len(paths) - len(pending)
+        print(f"Found {len(paths)} PDFs, {len(pending)} to ingest ({self.stats.skipped} already done)")
+
+        pool = await asyncpg.create_pool(ASYNCPG_DSN, min_size=1, max_size=self.workers, init=register_vector)
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor, \
+                    self.manifest.open("a", encoding="utf-8") as manifest:
+                await asyncio.gather(*[
+                    self._ingest_file(path, executor, pool, manifest,
+                                      done.get(path.relative_to(self.root).as_posix()))
+                    for path in pending
+                ])
+        finally:
+            await pool.close()
+
+        return self.stats
+
+    async def _ingest_file(self, path: Path, executor: ProcessPoolExecutor,
+                           pool: asyncpg.Pool, manifest, previous_id: Optional[str] = None) -> None:
+        relative = path.relative_to(self.root).as_posix()
+        async with self._document_slots:
+            try:
+                document_id = document_id_for(path, self.root)
+                loop = asyncio.get_running_loop()
+                parsed = await loop.run_in_executor(executor, parse_pdf, str(path))
+                embeddings = await self._embed(parsed["chunks"])
+                inserted = await self._write(pool, document_id, path.name, parsed, embeddings,
+                                             uuid.UUID(previous_id) if previous_id else None)
+            except Exception as exc:
+                self.stats.failed += 1
+                print(f"FAILED {relative}: {exc!r}", file=sys.stderr)
+                entry = {"path": relative, "status": "error", "error": repr(exc)}
+            else:
+                if inserted:
+                    self.stats.loaded += 1
+                    self.stats.chunks += len(parsed["chunks"])
+                    self.stats.bytes += parsed["content_size"]
+                else:
+                    self.stats.skipped += 1
+                entry = {
+                    "path": relative,
+                    "status": "ok",
+                    "document_id": str(document_id),
+                    "chunks": len(parsed["chunks"]),
+                }
+
+        manifest.write(json.dumps(entry) + "\n")
+        manifest.flush()
+
+    async def _embed(self, chunks: List[str]) -> List[np.ndarray]:
+        return list(await asyncio.gather(*[self._batcher.embed(chunk) for chunk in chunks]))
+
+    async def _embed_batch(self, batch: List[str]) -> List[np.ndarray]:
+        async with self._embed_slots:
+            return await self.embeddings.embed_texts(batch)
+
+    async def _write(self, pool: asyncpg.Pool, document_id: uuid.UUID, filename: str,
+                     parsed: Dict[str, Any], embeddings: List[np.ndarray],
+                     previous_id: Optional[uuid.UUID] = None) -> bool:
+        """
+        Insert the document and COPY its chunks in one transaction.
+
+        ``previous_id`` is the document an earlier version of the same file
+        was loaded as; it is deleted (with its chunks) in the same transaction,
+        so a changed file replaces its old copy instead of duplicating it.
+        """
+        now = datetime.utcnow()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                inserted = await conn.fetchval(
+                    """
+                    INSERT INTO documents
+                        (id, title, source, chunk_count, content_zstd, content_size,
+                         content_frame_size, content_frame_offsets, created_at, updated_at)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $9)
+                    ON CONFLICT (id) DO NOTHING
+                    RETURNING id
+                    """,
+                    document_id, parsed["title"], filename, len(parsed["chunks"]),
+                    parsed["content_zstd"], parsed["content_size"],
+                    parsed["content_frame_size"], parsed["content_frame_offsets"], now
+                )
+                if previous_id is not None and previous_id != document_id:
+                    await conn.execute("DELETE FROM documents WHERE id = $1", previous_id)
+                if inserted is None:
+                    # Loaded by an earlier run that stopped before updating the manifest.
+                    return False
+
+                await conn.copy_records_to_table(
+                    "document_chunks",
+                    columns=CHUNK_COLUMNS,
+                    records=[
+                        (uuid.uuid4(), document_id, i, content, embedding, now, now)
+                        for i, (content, embedding) in enumerate(zip(parsed["chunks"], embeddings))
+                    ]
+                )
+        return True
+
+
+def print_summary(stats: IngestStats, elapsed: float) -> None:
+    print(
+        f"Loaded {stats.loaded} documents ({stats.chunks} chunks, {stats.bytes / 1e6:.1f} MB of text) "
+        f"in {elapsed:.1f}s; skipped {stats.skipped}, failed {stats.failed}"
+    )
+    if elapsed > 0:
+        print(
+            f"Throughput: {stats.loaded / elapsed:.2f} documents/s, "
+            f"{stats.chunks / elapsed:.1f} chunks/s, {stats.bytes / 1e6 / elapsed:.2f} MB/s"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", type=Path, help="directory to scan recursively for PDFs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of PDF parsing processes (default: CPU count)")
+    parser.add_argument("--embed-batch-size", type=int, default=512,
+                        help="chunks per embeddings request, across documents "
+                             f"(default: 512, at most {MAX_EMBED_BATCH_SIZE})")
+    parser.add_argument("--embed-concurrency", type=int, default=8,
+                        help="concurrent embeddings requests (default: 8); also raises the "
+                             "number of documents in flight to at least this many")
+    parser.add_argument("--manifest", type=Path, default=None,
+                        help=f"manifest file (default: <directory>/{MANIFEST_NAME})")
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.embed_batch_size <= MAX_EMBED_BATCH_SIZE:
+        parser.error(f"--embed-batch-size must be between 1 and {MAX_EMBED_BATCH_SIZE}")
+
+    root = args.directory.resolve()
+    if not root.is_dir():
+        parser.error(f"{args.directory} is not a directory")
+
+    ingestor = BulkIngestor(
+        root=root,
+        manifest=args.manifest or root / MANIFEST_NAME,
+        workers=args.workers,
+        embed_batch_size=args.embed_batch_size,
+        embed_concurrency=args.embed_concurrency,
+    )
+    start = time.perf_counter()
+    stats = asyncio.run(ingestor.run())
+    print_summary(stats, time.perf_counter() - start)
+    if stats.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
-from sqlalchemy import text
 
-from app.database.db_connection import Base, async_engine
 from app.routes import document,query
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    
-    async with async_engine.begin() as conn:
-        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
-        await conn.run_sync(Base.metadata.create_all)
-    yield
-
+# The database schema is managed by Alembic (`alembic upgrade head`), which
+# runs once per deployment instead of on every worker start.
 app = FastAPI(
     title="RAG Q&A API",
     description="API for RAG-based question answering system using pg-vector and OpenAI embeddings",
-    version="0.1.0",
-    lifespan=lifespan
+    version="0.1.0"
 )
 
 
@@ -29,6 +19,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Cursor of the next page of GET /documents
 )
 
 app.include_router(document.router)
@@ -1,10 +1,13 @@
-from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Response
+from typing import List, Dict, Any, Iterator, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Response, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+import json
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 import uuid
-from app.database.db_connection import get_async_db
+from app.database.db_connection import get_async_db, get_async_read_db
 from app.service.document_service import DocumentService
 
 
@@ -31,11 +34,28 @@ class DocumentResponse(BaseModel):
     source: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    chunk_count: Optional[int] = None
 
 class DocumentDetail(DocumentResponse):
     chunk_count:int
+    content_size: int = Field(..., description="Size of the full document text in UTF-8 bytes")
     content: str
 
+class ChunkResponse(BaseModel):
+    chunk_id: str
+    chunk_index: int
+    content: str
+
+
+def _stream_json(document: Dict[str, Any]) -> Iterator[str]:
+    """Serialize a document as JSON, streaming its content iterator last."""
+    content = document.pop("content")
+    head = json.dumps(jsonable_encoder(document), ensure_ascii=False)
+    yield head[:-1] + ', "content": "'
+    for piece in content:
+        yield json.dumps(piece, ensure_ascii=False)[1:-1]
+    yield '"}'
+
 
     
 
@@ -60,26 +80,63 @@ async def upload_pdf_document(
 @router.get("/{document_id}", response_model=DocumentDetail)
 async def get_document(
     document_id: uuid.UUID,
-    db: AsyncSession = Depends(get_async_db)
+    offset: int = Query(0, ge=0, description="Byte offset into the document text"),
+    length: Optional[int] = Query(None, ge=1, description="Number of bytes of text to return"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Retrieve a specific document by ID with its full content."""
+    """
+    Retrieve a specific document by ID with its content, streamed.
+    
+    Use offset and length to page through large documents; ranges are
+    aligned to character boundaries, so consecutive ranges cover the text
+    exactly once.
+    """
     document_service = DocumentService(db)
-    result = await document_service.get_document(str(document_id))
+    result = await document_service.get_document(str(document_id), offset=offset, length=length)
     if not result:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+    return StreamingResponse(_stream_json(result), media_type="application/json")
+
+@router.get("/{document_id}/chunks", response_model=List[ChunkResponse])
+async def get_document_chunks(
+    document_id: uuid.UUID,
+    start: int = Query(0, ge=0, description="Index of the first chunk"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Retrieve a range of a document's chunks."""
+    document_service = DocumentService(db)
+    result = await document_service.get_document_chunks(str(document_id), start=start, limit=limit)
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
     return result
 
 @router.get("", response_model=List[DocumentResponse])
 async def list_documents(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_async_db)
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    source: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """List all documents with pagination."""
+    """List documents, newest first, with cursor pagination."""
     
     document_service = DocumentService(db)
-    docs= await document_service.list_documents(skip=skip, limit=limit)
-    return docs
+    try:
+        page = await document_service.list_documents(
+            limit=limit,
+            cursor=cursor,
+            source=source,
+            created_after=created_after,
+            created_before=created_before
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["documents"]
 
 @router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_document(
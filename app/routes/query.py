@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.db_connection import get_async_db
+from app.database.db_connection import get_async_db, get_async_read_db
 from app.service.rag import RetrievalService, GenerationService
 
 
@@ -45,19 +45,21 @@ class QueryResponse(BaseModel):
 @router.post("/search", response_model=SearchResult)
 async def search_documents(
     query_req: QueryRequest,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db)
 ):
     """Search for relevant document chunks."""
-    retrieval_service = RetrievalService(db)
+    retrieval_service = RetrievalService(db, read_db=read_db)
     result = await retrieval_service.search_documents(query_req.query)
     return result
 
 @router.post("", response_model=QueryResponse)
 async def answer_query(
     query_req: QueryRequest,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db)
 ):
     """Answer a query using RAG pipeline."""
-    generation_service = GenerationService(db)
+    generation_service = GenerationService(db, retrieval_service=RetrievalService(db, read_db=read_db))
     result = await generation_service.answer_query(query_req.query)
     return result
\ No newline at end of file
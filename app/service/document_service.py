@@ -1,17 +1,48 @@
-from typing import List, Dict, Any, Optional, BinaryIO
+from typing import List, Dict, Any, Optional, BinaryIO, Iterator, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import insert
+from sqlalchemy import insert, tuple_, func, LargeBinary
+from datetime import datetime, timezone
+import base64
+import io
 import uuid
 import os
 import tempfile
 from pathlib import Path
 from app.utils.text_processings import chunk_text as chunk_sentence
 
-from langchain_community.document_loaders import PyPDFLoader
 from app.database.models import Document, DocumentChunk
 from app.embeddings.openai import OpenAIEmbeddings
-from app.utils.text_processings import clean_text, extract_metadata, chunk_text
+from app.utils.text_processings import clean_text, extract_metadata, chunk_text, extract_pdf_text
+from app.utils.compression import compress_text, open_compressed, iter_text_range, frame_span
+
+def encode_cursor(created_at: datetime, document_id: uuid.UUID) -> str:
+    """Encode a document's keyset position as an opaque cursor string."""
+    raw = f"{created_at.isoformat()}|{document_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, document_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(document_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+
+
+def _as_naive_utc(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC (datetime.utcnow).
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
 
 class DocumentService:
     """Service for document processing and storage."""
@@ -43,12 +74,7 @@ class DocumentService:
             temp_path = temp_file.name
         
         try:
-           
-            loader = PyPDFLoader(temp_path)
-            pages = loader.load()
-            
-            
-            content = "\n\n".join([page.page_content for page in pages])
+            content = extract_pdf_text(temp_path)
             
            
             cleaned_content = clean_text(content)
@@ -61,10 +87,15 @@ class DocumentService:
             
            
             document_id = uuid.uuid4()
+            compressed = compress_text(cleaned_content)
             document = Document(
                 id=document_id,
                 title=title,
-                source=source
+                source=source,
+                content_zstd=compressed.blob,
+                content_size=compressed.size,
+                content_frame_size=compressed.frame_size,
+                content_frame_offsets=compressed.frame_offsets
             )
             
             self.db.add(document)
@@ -72,6 +103,7 @@ class DocumentService:
             
             
             chunks = chunk_sentence(cleaned_content)
+            document.chunk_count = len(chunks)
             
             
             chunk_embeddings = await self.embeddings.embed_texts(chunks)
@@ -99,33 +131,73 @@ class DocumentService:
             if os.path.exists(temp_path):
                 os.unlink(temp_path)
     
-    async def get_document(self, document_id: str) -> Optional[Dict[str, Any]]:
+    async def get_document(self,
+                           document_id: str,
+                           offset: int = 0,
+                           length: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
-        Retrieve a document by ID.
+        Retrieve a document by ID, with a byte range of its original text.
+        
+        The content is returned as an iterator that decompresses the stored
+        text incrementally. Only the compressed frames covering the range are
+        loaded, so the cost of a page does not grow with its offset.
         
         Args:
             document_id: Document ID
+            offset: Byte offset into the UTF-8 encoded text
+            length: Number of bytes to return (None returns the rest)
             
         Returns:
             Document information or None if not found
         """
-        query = select(Document).where(Document.id == uuid.UUID(document_id))
+        query = select(
+            Document.id,
+            Document.title,
+            Document.source,
+            Document.chunk_count,
+            Document.content_size,
+            Document.content_frame_size,
+            Document.content_frame_offsets,
+            Document.created_at,
+            Document.updated_at
+        ).where(Document.id == uuid.UUID(document_id))
         result = await self.db.execute(query)
-        document = result.scalars().first()
+        document = result.first()
         
         if not document:
             return None
-            
-       
-        chunks_query = select(DocumentChunk).where(
-            DocumentChunk.document_id == uuid.UUID(document_id)
-        ).order_by(DocumentChunk.chunk_index)
-        
-        chunks_result = await self.db.execute(chunks_query)
-        chunks = chunks_result.scalars().all()
-        
         
-        full_content = "\n".join(chunk.content for chunk in chunks)
+        chunk_count = document.chunk_count
+        content_size = document.content_size
+        content = None
+        if document.content_frame_offsets is not None:
+            first, end = frame_span(
+                document.content_frame_offsets, document.content_frame_size, offset, length
+            )
+            start = document.content_frame_offsets[first]
+            stop = document.content_frame_offsets[end]
+            # Stored uncompressed in TOAST (STORAGE EXTERNAL), so Postgres
+            # reads only the slice of the value that is asked for.
+            frames = b""
+            if stop > start:
+                frames = await self.db.scalar(
+                    select(
+                        func.substring(Document.content_zstd, start + 1, stop - start, type_=LargeBinary)
+                    ).where(Document.id == document.id)
+                )
+            content = iter_text_range(
+                open_compressed(frames),
+                offset - first * document.content_frame_size,
+                length,
+                align_start=offset > 0
+            )
+        else:
+            # Documents ingested before the original text was stored.
+            chunks = await self.get_document_chunks(document_id)
+            encoded = "\n".join(chunk["content"] for chunk in chunks).encode("utf-8")
+            content = iter_text_range(io.BytesIO(encoded), offset, length)
+            content_size = len(encoded)
+            chunk_count = len(chunks)
         
         return {
             "document_id": str(document.id),
@@ -133,35 +205,123 @@ class DocumentService:
             "source": document.source,
             "created_at": document.created_at,
             "updated_at": document.updated_at,
-            "chunk_count": len(chunks),
-            "content": full_content
+            "chunk_count": chunk_count,
+            "content_size": content_size,
+            "content": content
         }
     
-    async def list_documents(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    async def get_document_chunks(self,
+                                  document_id: str,
+                                  start: int = 0,
+                                  limit: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
         """
-        List all documents.
+        Retrieve a range of a document's chunks for display, without embeddings.
         
         Args:
-            skip: Number of documents to skip
-            limit: Maximum number of documents to return
+            document_id: Document ID
+            start: Index of the first chunk
+            limit: Maximum number of chunks to return (None returns the rest)
             
         Returns:
-            List of document information
+            List of chunks ordered by chunk index, or None if the document
+            does not exist
         """
-        query = select(Document).offset(skip).limit(limit)
+        query = select(
+            DocumentChunk.id,
+            DocumentChunk.chunk_index,
+            DocumentChunk.content
+        ).where(
+            DocumentChunk.document_id == uuid.UUID(document_id),
+            DocumentChunk.chunk_index >= start
+        ).order_by(DocumentChunk.chunk_index)
+        if limit is not None:
+            query = query.limit(limit)
+        
         result = await self.db.execute(query)
-        documents = result.scalars().all()
-        print(documents)
-        return [
+        chunks = [
             {
-                "document_id": str(doc.id),
-                "title": doc.title,
-                "created_at": doc.created_at,
-                "source":doc.source,
-                "updated_at": doc.updated_at
+                "chunk_id": str(row.id),
+                "chunk_index": row.chunk_index,
+                "content": row.content
             }
-            for doc in documents
+            for row in result
         ]
+        
+        if not chunks:
+            exists = await self.db.scalar(
+                select(Document.id).where(Document.id == uuid.UUID(document_id))
+            )
+            if exists is None:
+                return None
+        return chunks
+    
+    async def list_documents(self,
+                             limit: int = 100,
+                             cursor: Optional[str] = None,
+                             source: Optional[str] = None,
+                             created_after: Optional[datetime] = None,
+                             created_before: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        List documents, newest first, using keyset pagination.
+        
+        Args:
+            limit: Maximum number of documents to return
+            cursor: Cursor returned with the previous page (optional)
+            source: Only return documents with this source (optional)
+            created_after: Only return documents created at or after this time (optional)
+            created_before: Only return documents created before this time (optional)
+            
+        Returns:
+            Dictionary with the page of documents and the cursor of the next
+            page (None on the last page)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = select(
+            Document.id,
+            Document.title,
+            Document.source,
+            Document.chunk_count,
+            Document.created_at,
+            Document.updated_at
+        )
+        
+        if cursor:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            query = query.where(
+                tuple_(Document.created_at, Document.id) < tuple_(cursor_created_at, cursor_id)
+            )
+        if source is not None:
+            query = query.where(Document.source == source)
+        if created_after is not None:
+            query = query.where(Document.created_at >= _as_naive_utc(created_after))
+        if created_before is not None:
+            query = query.where(Document.created_at < _as_naive_utc(created_before))
+        
+        query = query.order_by(Document.created_at.desc(), Document.id.desc()).limit(limit + 1)
+        result = await self.db.execute(query)
+        rows = result.all()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        
+        return {
+            "documents": [
+                {
+                    "document_id": str(row.id),
+                    "title": row.title,
+                    "created_at": row.created_at,
+                    "source": row.source,
+                    "updated_at": row.updated_at,
+                    "chunk_count": row.chunk_count
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor
+        }
     
     async def delete_document(self, document_id: str) -> bool:
         """
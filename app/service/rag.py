@@ -1,21 +1,60 @@
 from typing import List, Dict, Any, Optional, Tuple
+import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text,bindparam,Integer
-from pgvector.sqlalchemy import Vector
+import numpy as np
 from app.database.models import  Query
-from app.embeddings.openai import OpenAIEmbeddings
-from app.config import TOP_K_RESULTS
+from app.database.types import Vector
+from app.embeddings.openai import OpenAIEmbeddings, get_openai_client
+from app.config import TOP_K_RESULTS, EMBEDDING_DIMENSION
 from typing import List, Dict, Any, Optional
-import openai
 from tenacity import retry, stop_after_attempt, wait_exponential
 from app.database.models import Query
+from app.utils.singleflight import SingleFlight
+from app.utils.text_processings import normalize_query
+
+
+# Concurrent identical queries share one vector search and one completion.
+_search_flights = SingleFlight()
+_answer_flights = SingleFlight()
+
+
+# Built once so the statement text is identical on every call: the asyncpg
+# dialect then reuses its per-connection prepared statement instead of
+# re-preparing. The query vector is bound once, through the CTE, and travels
+# in pgvector's binary format (see db_connection.register_vector_codec).
+RETRIEVAL_SQL = text("""
+    WITH q AS (
+        SELECT CAST(:query_embedding AS vector) AS embedding
+    )
+    SELECT 
+        dc.id, 
+        dc.content, 
+        dc.document_id,
+        d.title as document_title,
+        dc.embedding <=> q.embedding as distance
+    FROM 
+        q,
+        document_chunks dc
+    JOIN
+        documents d ON dc.document_id = d.id
+    ORDER BY 
+        distance
+    LIMIT :top_k
+""").bindparams(
+    bindparam("query_embedding", type_=Vector(EMBEDDING_DIMENSION)),
+    bindparam("top_k", type_=Integer()))
 
 
 class RetrievalService:
     """Service for retrieving relevant document chunks."""
     
-    def __init__(self, db: AsyncSession, embeddings: Optional[OpenAIEmbeddings] = None):
+    def __init__(self, db: AsyncSession, embeddings: Optional[OpenAIEmbeddings] = None,
+                 read_db: Optional[AsyncSession] = None):
         self.db = db
+        # Similarity search runs on read_db (a replica when configured); query
+        # logging always goes to the primary session.
+        self.read_db = read_db or db
         self.embeddings = embeddings or OpenAIEmbeddings()
     
     async def retrieve_relevant_chunks(self, query_text: str, top_k: int = TOP_K_RESULTS) -> List[Dict[str, Any]]:
@@ -32,57 +71,51 @@ class RetrievalService:
         
         query_embedding = await self.embeddings.embed_text(query_text)
         
+        key = (self.embeddings.model_name, normalize_query(query_text), top_k)
+        chunks = await _search_flights.do(
+            key, lambda: self._search_chunks(query_embedding, top_k)
+        )
         
        
         query = Query(
             query_text=query_text,
-            embedding=query_embedding
+            embedding=query_embedding,
+            retrieved_chunk_ids=[uuid.UUID(chunk["chunk_id"]) for chunk in chunks]
         )
         self.db.add(query)
-        await self.db.flush()
-        
+        await self.db.commit()
         
-        sql = text("""
-    SELECT 
-        dc.id, 
-        dc.content, 
-        dc.document_id,
-        d.title as document_title,
-        1 - (dc.embedding <=> :query_embedding) as similarity_score
-    FROM 
-        document_chunks dc
-    JOIN
-        documents d ON dc.document_id = d.id
-    ORDER BY 
-        dc.embedding <=> :query_embedding
-    LIMIT :top_k
-""").bindparams(
-    bindparam("query_embedding", type_=Vector(1536)),
-    bindparam("top_k", type_=Integer()))
+        return chunks
+    
+    async def _search_chunks(self, query_embedding: np.ndarray, top_k: int) -> List[Dict[str, Any]]:
+        """
+        Run the similarity search for an embedded query.
         
-        result = await self.db.execute(
-            sql, 
+        Args:
+            query_embedding: Embedding of the query text
+            top_k: Number of results to retrieve
+            
+        Returns:
+            List of relevant chunks with similarity scores
+        """
+        result = await self.read_db.execute(
+            RETRIEVAL_SQL, 
             {"query_embedding": query_embedding, "top_k": top_k}
         )
         
-        chunks = []
-        chunk_ids = []
-        
-        for row in result:
-            chunk_id = row.id
-            chunk_ids.append(chunk_id)
-            chunks.append({
-                "chunk_id": str(chunk_id),
+        chunks = [
+            {
+                "chunk_id": str(row.id),
                 "document_id": str(row.document_id),
                 "document_title": row.document_title,
                 "content": row.content,
-                "similarity_score": float(row.similarity_score)
-            })
-        
-        
-        query.retrieved_chunk_ids = chunk_ids
-        await self.db.commit()
-        
+                "similarity_score": 1 - float(row.distance)
+            }
+            for row in result
+        ]
+        # End the read transaction so its connection goes back to the pool
+        # before the query is logged and the answer is generated.
+        await self.read_db.commit()
         return chunks
     
     async def search_documents(self, query_text: str, top_k: int = TOP_K_RESULTS) -> Dict[str, Any]:
@@ -110,6 +143,7 @@ class GenerationService:
     def __init__(self, db: AsyncSession, retrieval_service: Optional[RetrievalService] = None):
         self.db = db
         self.retrieval_service = retrieval_service or RetrievalService(db)
+        self.client = get_openai_client()
     
    
     async def generate_answer(self, query_id: str, context_chunks: List[Dict[str, Any]], 
@@ -143,7 +177,7 @@ class GenerationService:
         ]
         
         
-        response =  openai.chat.completions.create(
+        response = await self.client.chat.completions.create(
             model=model,
             messages=messages,
             max_tokens=500,
@@ -169,7 +203,10 @@ class GenerationService:
         chunks = search_results["results"]
         
       
-        answer = await self.generate_answer(query_text, chunks)
+        key = (normalize_query(query_text), tuple(chunk["chunk_id"] for chunk in chunks))
+        answer = await _answer_flights.do(
+            key, lambda: self.generate_answer(query_text, chunks)
+        )
         
         from sqlalchemy.future import select
         query_stmt = select(Query).order_by(Query.created_at.desc()).limit(1)
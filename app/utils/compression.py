@@ -0,0 +1,149 @@
+import codecs
+import io
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple
+
+import zstandard
+
+
+ZSTD_LEVEL = 3
+READ_SIZE = 64 * 1024
+# Uncompressed bytes per independently decodable zstd frame.
+FRAME_SIZE = 256 * 1024
+
+
+class CompressedText(NamedTuple):
+    """Text compressed as a sequence of zstd frames, with a frame index."""
+    blob: bytes
+    size: int  # Size of the text in UTF-8 bytes
+    frame_size: int
+    frame_offsets: List[int]  # Start of each frame in blob, plus the blob length
+
+
+def compress_text(text: str, frame_size: int = FRAME_SIZE) -> CompressedText:
+    """
+    Compress text as UTF-8 with zstd, one frame per ``frame_size`` bytes.
+
+    Each frame can be decompressed on its own, so a byte range of the text
+    only needs the frames that cover it (see frame_span).
+
+    Args:
+        text: Text to compress
+        frame_size: Uncompressed bytes per frame
+
+    Returns:
+        Compressed text with its frame index
+    """
+    data = text.encode("utf-8")
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    frames = [compressor.compress(data[i:i + frame_size]) for i in range(0, len(data), frame_size)]
+
+    frame_offsets = [0]
+    for frame in frames:
+        frame_offsets.append(frame_offsets[-1] + len(frame))
+    return CompressedText(b"".join(frames), len(data), frame_size, frame_offsets)
+
+
+def frame_span(frame_offsets: List[int],
+               frame_size: int,
+               offset: int,
+               length: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Return the frames [first, end) needed to read a byte range of the text.
+
+    The span includes the frame after the range when the range ends within
+    a few bytes of a frame boundary, so that iter_text_range can complete a
+    character cut by the end of the range.
+
+    Args:
+        frame_offsets: Frame index from compress_text
+        frame_size: Uncompressed bytes per frame
+        offset: Byte offset of the start of the range
+        length: Number of bytes in the range (None reads to the end)
+
+    Returns:
+        Tuple of the first frame and one past the last frame
+    """
+    frame_count = len(frame_offsets) - 1
+    first = min(offset // frame_size, frame_count)
+    if length is None:
+        return first, frame_count
+    # A UTF-8 character is at most 4 bytes: 3 may spill past the range end.
+    end = min((offset + length + 3) // frame_size + 1, frame_count)
+    return first, max(end, first)
+
+
+def open_compressed(blob: bytes) -> BinaryIO:
+    """Return a readable stream over the decompressed content of zstd frames."""
+    return zstandard.ZstdDecompressor().stream_reader(io.BytesIO(blob), read_across_frames=True)
+
+
+def _is_continuation(byte: int) -> bool:
+    return byte & 0xC0 == 0x80
+
+
+def iter_text_range(stream: BinaryIO,
+                    offset: int = 0,
+                    length: Optional[int] = None,
+                    read_size: int = READ_SIZE,
+                    align_start: Optional[bool] = None) -> Iterator[str]:
+    """
+    Decode a byte range of a UTF-8 stream incrementally.
+
+    Ranges are aligned to character boundaries: a character that straddles
+    the start of the range is skipped, and one that straddles the end is
+    completed. Consecutive ranges (offset, offset + length, ...) therefore
+    cover the text exactly once.
+
+    Args:
+        stream: Readable binary stream of UTF-8 text
+        offset: Byte offset of the start of the range
+        length: Number of bytes in the range (None reads to the end)
+        read_size: Number of bytes to read at a time
+        align_start: Skip a character cut by the start of the range; defaults
+            to offset > 0 (pass True when the stream starts mid-text)
+
+    Returns:
+        Iterator over decoded pieces of the range
+    """
+    to_skip = offset
+    while to_skip > 0:
+        data = stream.read(min(read_size, to_skip))
+        if not data:
+            return
+        to_skip -= len(data)
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    remaining = length
+    if align_start is None:
+        align_start = offset > 0
+
+    while remaining is None or remaining > 0:
+        data = stream.read(read_size if remaining is None else min(read_size, remaining))
+        if not data:
+            break
+        if remaining is not None:
+            remaining -= len(data)
+
+        if align_start:
+            start = 0
+            while start < len(data) and _is_continuation(data[start]):
+                start += 1
+            data = data[start:]
+            align_start = not data
+
+        text = decoder.decode(data)
+        if text:
+            yield text
+
+    # Complete a character cut by the end of the range.
+    while decoder.getstate()[0]:
+        data = stream.read(1)
+        if not data or not _is_continuation(data[0]):
+            break
+        text = decoder.decode(data)
+        if text:
+            yield text
+
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
@@ -0,0 +1,145 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+A = TypeVar("A")
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    # Mark the exception as retrieved so a leader failure with no waiting
+    # followers does not log "Future exception was never retrieved".
+    if not future.cancelled():
+        future.exception()
+
+
+def _fail_unresolved(future: asyncio.Future) -> None:
+    # Never leave followers waiting on a future the leader did not resolve.
+    if not future.done():
+        future.set_exception(RuntimeError("Single-flight call finished without a result"))
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-flight computation.
+
+    The first caller for a key runs the computation; callers arriving while it
+    is still running wait for it and receive the same result (or exception).
+    Nothing is kept once the computation finishes, so this is not a cache.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` for ``key`` unless a call with the same key is already running.
+
+        Args:
+            key: Key identifying duplicate calls
+            fn: Zero-argument coroutine function producing the result
+
+        Returns:
+            The result of the (possibly shared) computation
+        """
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leader was cancelled, not us: run the call ourselves.
+                if future.cancelled():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            _fail_unresolved(future)
+            self._calls.pop(key, None)
+
+    async def do_many(self,
+                      keys: Sequence[Hashable],
+                      args: Sequence[A],
+                      fn: Callable[[List[A]], Awaitable[List[T]]]) -> List[T]:
+        """
+        Batch variant of :meth:`do` for per-item keys.
+
+        Items whose key is already in flight wait for that computation. The
+        remaining items (deduplicated by key) are passed to ``fn`` in a single
+        call, which must return one result per argument, in order.
+
+        Args:
+            keys: One key per item
+            args: One argument per item, passed to ``fn`` for items not in flight
+            fn: Coroutine function computing results for a list of arguments
+
+        Returns:
+            List of results, one for each key
+        """
+        waiting: Dict[Hashable, asyncio.Future] = {}
+        owned: Dict[Hashable, asyncio.Future] = {}
+        owned_args: List[Any] = []
+        loop = asyncio.get_running_loop()
+
+        for key, arg in zip(keys, args):
+            if key in waiting or key in owned:
+                continue
+            future = self._calls.get(key)
+            if future is not None:
+                waiting[key] = future
+                continue
+            future = loop.create_future()
+            future.add_done_callback(_consume_exception)
+            self._calls[key] = future
+            owned[key] = future
+            owned_args.append(arg)
+
+        if owned:
+            try:
+                results = await fn(owned_args)
+                if len(results) != len(owned_args):
+                    raise ValueError(
+                        f"Expected {len(owned_args)} results, got {len(results)}"
+                    )
+            except asyncio.CancelledError:
+                for future in owned.values():
+                    future.cancel()
+                raise
+            except BaseException as exc:
+                for future in owned.values():
+                    future.set_exception(exc)
+                raise
+            else:
+                for future, result in zip(owned.values(), results):
+                    future.set_result(result)
+            finally:
+                for key, future in owned.items():
+                    _fail_unresolved(future)
+                    self._calls.pop(key, None)
+
+        resolved: Dict[Hashable, Any] = {key: future.result() for key, future in owned.items()}
+        for key, future in waiting.items():
+            try:
+                resolved[key] = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    index = list(keys).index(key)
+                    resolved[key] = (await self.do_many([key], [args[index]], fn))[0]
+                else:
+                    raise
+
+        return [resolved[key] for key in keys]
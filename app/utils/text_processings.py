@@ -1,9 +1,15 @@
 import re
+from functools import lru_cache
 from typing import List, Dict, Any
-import tiktoken
 
 from app.config import CHUNK_SIZE, CHUNK_OVERLAP
-from langchain.document_loaders import PyPDFLoader
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(encoding_name: str):
+    # tiktoken is imported on first use to keep it out of worker startup.
+    import tiktoken
+    return tiktoken.get_encoding(encoding_name)
 
 def get_token_count(text: str, encoding_name: str = "cl100k_base") -> int:
     """
@@ -16,7 +22,7 @@ def get_token_count(text: str, encoding_name: str = "cl100k_base") -> int:
     Returns:
         Number of tokens
     """
-    encoding = tiktoken.get_encoding(encoding_name)
+    encoding = _get_encoding(encoding_name)
     tokens = encoding.encode(text)
     return len(tokens)
 
@@ -74,6 +80,19 @@ def clean_text(text: str) -> str:
     
     return text
 
+def normalize_query(text: str) -> str:
+    """
+    Normalize query text so trivially different spellings of the same question
+    (case, surrounding or repeated whitespace) map to the same key.
+    
+    Args:
+        text: Query text
+        
+    Returns:
+        Normalized query text
+    """
+    return " ".join(text.split()).casefold()
+
 def extract_metadata(text: str) -> Dict[str, Any]:
     """
     Extract metadata from text if available (e.g., from document headers).
@@ -97,7 +116,25 @@ def extract_metadata(text: str) -> Dict[str, Any]:
     return metadata
 
 
+def extract_pdf_text(path: str) -> str:
+    """
+    Extract the text of all pages of a PDF file.
+    
+    Args:
+        path: Path to the PDF file
+        
+    Returns:
+        Page contents joined by blank lines
+    """
+    # langchain is heavy to import; load it on first use only.
+    from langchain_community.document_loaders import PyPDFLoader
+    
+    pages = PyPDFLoader(path).load()
+    return "\n\n".join([page.page_content for page in pages])
+
+
 def load_split_pdf_file(pdf_file, text_splitter):
+    from langchain_community.document_loaders import PyPDFLoader
     loaded = PyPDFLoader(pdf_file)
     data = loaded.load_and_split(text_splitter)
     return data
\ No newline at end of file
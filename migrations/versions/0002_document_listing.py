@@ -0,0 +1,54 @@
+"""Chunk counts and keyset pagination indexes for document listing
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "documents",
+        sa.Column("chunk_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE documents d
+        SET chunk_count = c.chunk_count
+        FROM (
+            SELECT document_id, count(*) AS chunk_count
+            FROM document_chunks
+            GROUP BY document_id
+        ) c
+        WHERE c.document_id = d.id
+        """
+    )
+
+    op.execute("UPDATE documents SET created_at = timezone('utc', now()) WHERE created_at IS NULL")
+    op.alter_column("documents", "created_at", existing_type=sa.DateTime(), nullable=False)
+
+    op.create_index("ix_documents_created_at_id", "documents", ["created_at", "id"])
+    op.create_index("ix_documents_source_created_at_id", "documents", ["source", "created_at", "id"])
+    op.create_index("ix_document_chunks_document_id", "document_chunks", ["document_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_document_chunks_document_id", table_name="document_chunks")
+    op.drop_index("ix_documents_source_created_at_id", table_name="documents")
+    op.drop_index("ix_documents_created_at_id", table_name="documents")
+    op.alter_column("documents", "created_at", existing_type=sa.DateTime(), nullable=True)
+    op.drop_column("documents", "chunk_count")
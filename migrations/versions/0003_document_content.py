@@ -0,0 +1,37 @@
+"""Compressed original text on documents, with its frame index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("documents", sa.Column("content_zstd", sa.LargeBinary(), nullable=True))
+    op.add_column("documents", sa.Column("content_size", sa.BigInteger(), nullable=True))
+    # The content is already zstd-compressed; keep TOAST from compressing it again.
+    op.execute("ALTER TABLE documents ALTER COLUMN content_zstd SET STORAGE EXTERNAL")
+    op.add_column("documents", sa.Column("content_frame_size", sa.Integer(), nullable=True))
+    op.add_column("documents", sa.Column("content_frame_offsets", postgresql.ARRAY(sa.BigInteger()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("documents", "content_frame_offsets")
+    op.drop_column("documents", "content_frame_size")
+    op.drop_column("documents", "content_size")
+    op.drop_column("documents", "content_zstd")
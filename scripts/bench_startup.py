@@ -0,0 +1,87 @@
+"""
+Measure worker cold-start time.
+
+Reports, over several fresh interpreters:
+
+- import: time to import ``app.main`` (what every uvicorn worker pays)
+- first request: time from launching ``uvicorn app.main:app`` until the
+  first ``GET /health`` is served (with --serve)
+
+Usage:
+    python scripts/bench_startup.py [--runs N] [--serve] [--port PORT]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    env["PYTHONPATH"] = str(ROOT)
+    return env
+
+
+def measure_import() -> float:
+    output = subprocess.check_output(
+        [sys.executable, "-W", "ignore", "-c", IMPORT_SNIPPET], cwd=ROOT, env=_env()
+    )
+    return float(output.decode().strip().splitlines()[-1])
+
+
+def measure_first_request(port: int, timeout: float = 30.0) -> float:
+    url = f"http://127.0.0.1:{port}/health"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=_env(),
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"{url} was not served within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def report(name: str, samples: list) -> None:
+    print(
+        f"{name:<14} median {statistics.median(samples) * 1000:8.1f} ms  "
+        f"min {min(samples) * 1000:8.1f} ms  max {max(samples) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--serve", action="store_true", help="also measure time to first served request")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    report("import", [measure_import() for _ in range(args.runs)])
+    if args.serve:
+        report("first request", [measure_first_request(args.port) for _ in range(args.runs)])
+
+
+if __name__ == "__main__":
+    main()
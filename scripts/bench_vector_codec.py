@@ -0,0 +1,68 @@
+"""
+Micro-benchmark of the client-side CPU spent on query vectors.
+
+Compares, per search request, the work done before and after switching to
+pgvector's binary codec:
+
+- before: the OpenAI response is decoded to a list of floats, and the query
+  vector is formatted as a text literal twice (it was bound twice)
+- after: the response is decoded straight into a float32 array, and the
+  vector is encoded once in binary format
+
+It also compares encoding/decoding a single vector in each format, which is
+the per-chunk cost on ingestion.
+
+Usage:
+    python scripts/bench_vector_codec.py [--iterations N]
+"""
+import argparse
+import base64
+import time
+
+import numpy as np
+from pgvector import Vector
+
+
+DIMENSION = 1536
+
+
+def cpu_time_per_call(fn, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    vector = np.random.default_rng(0).standard_normal(DIMENSION).astype(np.float32)
+    payload = base64.b64encode(vector.tobytes()).decode("ascii")
+    text_value = Vector._to_db(vector)
+    binary_value = Vector._to_db_binary(vector)
+
+    def query_before():
+        embedding = np.frombuffer(base64.b64decode(payload), dtype="float32").tolist()
+        Vector._to_db(embedding, DIMENSION)
+        Vector._to_db(embedding, DIMENSION)
+
+    def query_after():
+        embedding = np.frombuffer(base64.b64decode(payload), dtype="<f4")
+        Vector._to_db_binary(embedding)
+
+    cases = [
+        ("query (before)", query_before),
+        ("query (after)", query_after),
+        ("encode text", lambda: Vector._to_db(vector, DIMENSION)),
+        ("encode binary", lambda: Vector._to_db_binary(vector)),
+        ("decode text", lambda: Vector._from_db(text_value)),
+        ("decode binary", lambda: Vector._from_db_binary(binary_value)),
+    ]
+    for name, fn in cases:
+        print(f"{name:<16} {cpu_time_per_call(fn, args.iterations) * 1e6:10.1f} us CPU per call")
+
+
+if __name__ == "__main__":
+    main()
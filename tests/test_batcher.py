@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+from app.embeddings.batcher import EmbeddingBatcher
+
+
+def make_recorder(delay: float = 0.0):
+    batches = []
+
+    async def embed_batch(texts):
+        batches.append(list(texts))
+        await asyncio.sleep(delay)
+        return [[float(len(text))] for text in texts]
+
+    return embed_batch, batches
+
+
+def test_flushes_when_batch_is_full():
+    async def scenario():
+        embed_batch, batches = make_recorder()
+        batcher = EmbeddingBatcher(embed_batch, max_batch_size=4, max_wait=10)
+        results = await asyncio.wait_for(
+            asyncio.gather(*[batcher.embed("x" * i) for i in range(8)]), timeout=1
+        )
+        return results, batches
+
+    results, batches = asyncio.run(scenario())
+    assert results == [[float(i)] for i in range(8)]
+    assert [len(batch) for batch in batches] == [4, 4]
+
+
+def test_flushes_partial_batch_after_window():
+    async def scenario():
+        embed_batch, batches = make_recorder()
+        batcher = EmbeddingBatcher(embed_batch, max_batch_size=100, max_wait=0.02)
+        start = time.perf_counter()
+        results = await asyncio.gather(*[batcher.embed(text) for text in ["a", "bb", "ccc"]])
+        return results, batches, time.perf_counter() - start
+
+    results, batches, elapsed = asyncio.run(scenario())
+    assert results == [[1.0], [2.0], [3.0]]
+    assert batches == [["a", "bb", "ccc"]]
+    assert 0.02 <= elapsed < 0.5
+
+
+def test_errors_reach_every_caller():
+    async def scenario():
+        async def fail(texts):
+            raise ValueError("provider down")
+
+        batcher = EmbeddingBatcher(fail, max_batch_size=2, max_wait=0.01)
+        return await asyncio.gather(batcher.embed("a"), batcher.embed("b"), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_result_count_mismatch_fails_callers():
+    async def scenario():
+        async def short(texts):
+            return [[0.0]] * (len(texts) - 1)
+
+        batcher = EmbeddingBatcher(short, max_batch_size=3, max_wait=0.01)
+        return await asyncio.wait_for(
+            asyncio.gather(*[batcher.embed(text) for text in "abc"], return_exceptions=True), timeout=1
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_flush_does_not_leave_callers_waiting():
+    async def scenario():
+        embed_batch, _ = make_recorder(delay=10)
+        batcher = EmbeddingBatcher(embed_batch, max_batch_size=2, max_wait=10)
+        callers = [asyncio.ensure_future(batcher.embed(text)) for text in "ab"]
+        await asyncio.sleep(0.01)
+        for task in list(batcher._tasks):
+            task.cancel()
+        return await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), timeout=1)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
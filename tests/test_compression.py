@@ -0,0 +1,65 @@
+import io
+import random
+
+import pytest
+
+from app.utils.compression import compress_text, frame_span, iter_text_range, open_compressed
+
+
+def sample_text(length: int = 400) -> str:
+    rng = random.Random(0)
+    return "".join(rng.choice("abc é中😀\n") for _ in range(length))
+
+
+def read_range(compressed, offset, length, read_size=7):
+    """Read a range the way DocumentService does: only the frames it needs."""
+    first, end = frame_span(compressed.frame_offsets, compressed.frame_size, offset, length)
+    frames = compressed.blob[compressed.frame_offsets[first]:compressed.frame_offsets[end]]
+    return "".join(iter_text_range(
+        open_compressed(frames),
+        offset - first * compressed.frame_size,
+        length,
+        read_size=read_size,
+        align_start=offset > 0
+    ))
+
+
+def test_compress_text_splits_into_frames():
+    text = sample_text()
+    compressed = compress_text(text, frame_size=64)
+    assert compressed.size == len(text.encode("utf-8"))
+    assert len(compressed.frame_offsets) - 1 == -(-compressed.size // 64)
+    assert compressed.frame_offsets[-1] == len(compressed.blob)
+    assert "".join(iter_text_range(open_compressed(compressed.blob))) == text
+
+
+def test_empty_text():
+    compressed = compress_text("")
+    assert compressed.frame_offsets == [0]
+    assert read_range(compressed, 0, None) == ""
+    assert read_range(compressed, 10, 5) == ""
+
+
+@pytest.mark.parametrize("length", [1, 2, 3, 7, 64, 100, 1000])
+@pytest.mark.parametrize("frame_size", [16, 64, 10_000])
+def test_consecutive_ranges_cover_text_exactly_once(length, frame_size):
+    text = sample_text()
+    compressed = compress_text(text, frame_size=frame_size)
+    pages = [read_range(compressed, offset, length) for offset in range(0, compressed.size, length)]
+    assert "".join(pages) == text
+
+
+def test_frame_span_loads_only_needed_frames():
+    compressed = compress_text("x" * 1000, frame_size=100)
+    assert frame_span(compressed.frame_offsets, 100, 450, 20) == (4, 5)
+    # A range ending on a frame boundary includes the next frame to finish a character.
+    assert frame_span(compressed.frame_offsets, 100, 450, 50) == (4, 6)
+    assert frame_span(compressed.frame_offsets, 100, 950, None) == (9, 10)
+    assert frame_span(compressed.frame_offsets, 100, 5000, 10) == (10, 10)
+
+
+def test_range_on_plain_stream_skips_and_completes_characters():
+    data = "a中b".encode("utf-8")  # 中 is bytes 1-3
+    assert "".join(iter_text_range(io.BytesIO(data), 0, 2)) == "a中"
+    assert "".join(iter_text_range(io.BytesIO(data), 2, 2)) == ""
+    assert "".join(iter_text_range(io.BytesIO(data), 4, 2)) == "b"
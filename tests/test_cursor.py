@@ -0,0 +1,20 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.service.document_service import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678)
+    document_id = uuid.uuid4()
+    cursor = encode_cursor(created_at, document_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, document_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "zzz", "bm90LWEtY3Vyc29y", encode_cursor(datetime(2025, 1, 1), uuid.uuid4())[:-4]])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pytest
+
+from app.ingest import BulkIngestor, main, read_manifest
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def fetchval(self, sql, *args):
+        self.statements.append(("insert", args[0]))
+        return args[0]
+
+    async def execute(self, sql, *args):
+        self.statements.append((sql.split()[0].lower(), *args))
+
+    async def copy_records_to_table(self, table, columns, records):
+        self.statements.append(("copy", len(list(records))))
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def make_ingestor(tmp_path, embeddings=None, **kwargs):
+    options = dict(workers=1, embed_batch_size=4, embed_concurrency=2)
+    options.update(kwargs)
+    return BulkIngestor(tmp_path, tmp_path / "manifest.jsonl", embeddings=embeddings or object(), **options)
+
+
+def test_read_manifest_keeps_latest_loaded_id(tmp_path):
+    manifest = tmp_path / "manifest.jsonl"
+    first, second = uuid.uuid4(), uuid.uuid4()
+    manifest.write_text("\n".join([
+        json.dumps({"path": "a.pdf", "status": "ok", "document_id": str(first)}),
+        json.dumps({"path": "b.pdf", "status": "error", "error": "boom"}),
+        json.dumps({"path": "a.pdf", "status": "ok", "document_id": str(second)}),
+        '{"path": "c.pdf", "sta',
+    ]))
+    assert read_manifest(manifest) == {"a.pdf": str(second)}
+
+
+def test_write_replaces_previous_version(tmp_path):
+    parsed = {
+        "title": "t", "content_zstd": b"", "content_size": 0,
+        "content_frame_size": 1, "content_frame_offsets": [0], "chunks": ["a", "b"],
+    }
+    embeddings = [np.zeros(3, dtype=np.float32)] * 2
+    document_id, previous_id = uuid.uuid4(), uuid.uuid4()
+    pool = FakePool()
+
+    inserted = asyncio.run(make_ingestor(tmp_path)._write(
+        pool, document_id, "a.pdf", parsed, embeddings, previous_id
+    ))
+
+    assert inserted is True
+    assert pool.conn.statements == [("insert", document_id), ("delete", previous_id), ("copy", 2)]
+
+
+class RecordingEmbeddings:
+    def __init__(self):
+        self.batches = []
+
+    async def embed_texts(self, texts):
+        self.batches.append(list(texts))
+        return [np.full(3, len(text), dtype=np.float32) for text in texts]
+
+
+def test_chunks_of_several_documents_share_batches(tmp_path):
+    embeddings = RecordingEmbeddings()
+    ingestor = make_ingestor(tmp_path, embeddings, embed_batch_size=4)
+
+    async def scenario():
+        documents = [["a", "bb"], ["ccc"], ["dddd", "eeeee", "ffffff"]]
+        return await asyncio.gather(*[ingestor._embed(chunks) for chunks in documents])
+
+    results = asyncio.run(scenario())
+    assert [[int(e[0]) for e in result] for result in results] == [[1, 2], [3], [4, 5, 6]]
+    assert [len(batch) for batch in embeddings.batches] == [4, 2]
+
+
+def test_rejects_batch_size_above_provider_limit(tmp_path):
+    with pytest.raises(SystemExit):
+        main([str(tmp_path), "--embed-batch-size", "4096"])
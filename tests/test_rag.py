@@ -0,0 +1,84 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.service.rag import RetrievalService
+
+
+class FakePool:
+    """Fixed number of connections; checking one out times out like DB_POOL_TIMEOUT."""
+
+    def __init__(self, size: int, timeout: float = 1.0):
+        self._slots = asyncio.Semaphore(size)
+        self.timeout = timeout
+
+    async def checkout(self) -> None:
+        await asyncio.wait_for(self._slots.acquire(), self.timeout)
+
+    def checkin(self) -> None:
+        self._slots.release()
+
+
+class FakeSession:
+    """Holds a pool connection from its first statement until commit or close, like AsyncSession."""
+
+    def __init__(self, pool: FakePool):
+        self.pool = pool
+        self.connected = False
+        self.added = []
+
+    async def _connect(self) -> None:
+        if not self.connected:
+            await self.pool.checkout()
+            self.connected = True
+
+    def _release(self) -> None:
+        if self.connected:
+            self.pool.checkin()
+            self.connected = False
+
+    async def execute(self, statement, params=None):
+        await self._connect()
+        await asyncio.sleep(0.01)
+        return [SimpleNamespace(id=uuid.uuid4(), content="text", document_id=uuid.uuid4(),
+                                document_title="title", distance=0.25)]
+
+    def add(self, obj) -> None:
+        self.added.append(obj)
+
+    async def commit(self) -> None:
+        if self.added:
+            # Flushing the pending rows needs a connection.
+            await self._connect()
+            self.added.clear()
+        self._release()
+
+    async def close(self) -> None:
+        self._release()
+
+
+class FakeEmbeddings:
+    model_name = "test-model"
+
+    async def embed_text(self, text):
+        return np.zeros(3, dtype=np.float32)
+
+
+def test_concurrent_searches_do_not_starve_a_small_pool():
+    async def scenario():
+        pool = FakePool(size=2)
+
+        async def search(i):
+            db, read_db = FakeSession(pool), FakeSession(pool)
+            service = RetrievalService(db, embeddings=FakeEmbeddings(), read_db=read_db)
+            chunks = await service.retrieve_relevant_chunks(f"query {i}", top_k=1)
+            return chunks, db.connected or read_db.connected
+
+        return await asyncio.gather(*[search(i) for i in range(8)])
+
+    results = asyncio.run(scenario())
+    assert all(len(chunks) == 1 for chunks, _ in results)
+    # Every connection was returned to the pool.
+    assert not any(connected for _, connected in results)
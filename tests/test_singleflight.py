@@ -0,0 +1,106 @@
+import asyncio
+
+from app.utils.singleflight import SingleFlight
+
+
+def test_do_coalesces_concurrent_calls():
+    async def scenario():
+        flights = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*[flights.do("key", compute) for _ in range(10)])
+        return results, calls
+
+    results, calls = asyncio.run(scenario())
+    assert results == [42] * 10
+    assert len(calls) == 1
+
+
+def test_do_does_not_cache_after_completion():
+    async def scenario():
+        flights = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return len(calls)
+
+        return await flights.do("key", compute), await flights.do("key", compute)
+
+    assert asyncio.run(scenario()) == (1, 2)
+
+
+def test_do_propagates_errors_to_followers():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        return await asyncio.gather(*[flights.do("key", fail) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_do_follower_reruns_when_leader_is_cancelled():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.create_task(flights.do("key", compute))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flights.do("key", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.wait_for(follower, timeout=1)
+
+    assert asyncio.run(scenario()) == "done"
+
+
+def test_do_many_sends_only_keys_not_in_flight():
+    async def scenario():
+        flights = SingleFlight()
+        batches = []
+
+        async def double(args):
+            batches.append(list(args))
+            await asyncio.sleep(0.01)
+            return [arg * 2 for arg in args]
+
+        results = await asyncio.gather(
+            flights.do_many([1, 2, 2, 3], [1, 2, 2, 3], double),
+            flights.do_many([3, 4], [3, 4], double),
+        )
+        return results, batches
+
+    results, batches = asyncio.run(scenario())
+    assert results == [[2, 4, 4, 6], [6, 8]]
+    assert batches == [[1, 2, 3], [4]]
+
+
+def test_do_many_result_count_mismatch_fails_owner_and_followers():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def short(args):
+            await asyncio.sleep(0.01)
+            return [0] * (len(args) - 1)
+
+        owner = asyncio.create_task(flights.do_many(["a", "b"], ["a", "b"], short))
+        await asyncio.sleep(0)
+        follower = asyncio.wait_for(flights.do_many(["b"], ["b"], short), timeout=1)
+        return await asyncio.gather(owner, follower, return_exceptions=True)
+
+    owner_result, follower_result = asyncio.run(scenario())
+    assert isinstance(owner_result, ValueError)
+    assert isinstance(follower_result, ValueError)